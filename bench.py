@@ -0,0 +1,260 @@
+# bench.py
+# Load test for the command handlers in main.py: runs the real command coroutines against
+# fake ctx/Member/Guild objects and a throwaway sqlite file, no Discord connection needed.
+#
+#   python bench.py --users 1000 --commands 20000 --concurrency 64 --mix fish=50,buy=15,nuke=10,leaderboard=10,balance=15
+#   python bench.py --cache --json          # write-behind cache on, machine-readable output
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+import aiosqlite
+
+import main
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+DEFAULT_MIX = "fish=50,buy=15,nuke=10,leaderboard=10,balance=10,inventory=5"
+
+# -------------------------
+# Fake discord objects
+# -------------------------
+class FakeRole:
+    def __init__(self, name):
+        self.name = name
+
+class FakeMember:
+    def __init__(self, user_id: int, admin: bool = False):
+        self.id = user_id
+        self.name = f"player{user_id}"
+        self.display_name = self.name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+        self.roles = [FakeRole(main.ADMIN_ROLE)] if admin else []
+
+class FakeGuild:
+    def __init__(self, guild_id: int, members):
+        self.id = guild_id
+        self.name = f"guild{guild_id}"
+        self._members = {m.id: m for m in members}
+
+    def get_member(self, user_id):
+        return self._members.get(user_id)
+
+class FakeChannel:
+    def __init__(self, channel_id: int, stats):
+        self.id = channel_id
+        self._stats = stats
+
+    async def send(self, content=None, **kwargs):
+        # used by the outbox, which sends to the channel rather than through ctx
+        self._stats["sends"] += 1
+        if self._stats["send_latency"]:
+            await asyncio.sleep(self._stats["send_latency"])
+
+class FakeContext:
+    def __init__(self, author, guild, channel, stats):
+        self.author = author
+        self.guild = guild
+        self.channel = channel
+        self.message = None
+        self.interaction = None
+        self.command = None
+        self._stats = stats
+
+    async def send(self, content=None, **kwargs):
+        self._stats["sends"] += 1
+        if self._stats["send_latency"]:
+            await asyncio.sleep(self._stats["send_latency"])
+
+# -------------------------
+# Commit counting
+# -------------------------
+_commits = 0
+_real_commit = aiosqlite.Connection.commit
+
+async def _counting_commit(self):
+    global _commits
+    _commits += 1
+    return await _real_commit(self)
+
+aiosqlite.Connection.commit = _counting_commit
+
+# -------------------------
+# Workload
+# -------------------------
+def parse_mix(spec: str):
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in COMMANDS:
+            raise SystemExit(f"unknown command in mix: {name} (choose from {', '.join(COMMANDS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+def _pick_other(members, me):
+    other = random.choice(members)
+    return other if other.id != me.id else None
+
+COMMANDS = {
+    "fish": lambda ctx, members: main.cmd_fish.callback(ctx),
+    "buy": lambda ctx, members: main.cmd_buy.callback(ctx, random.choice(["petfood", "nuke", "rod"]), 1),
+    "nuke": lambda ctx, members: main.cmd_nuke.callback(ctx, _pick_other(members, ctx.author)),
+    "leaderboard": lambda ctx, members: main.cmd_leaderboard.callback(ctx),
+    "balance": lambda ctx, members: main.cmd_balance.callback(ctx),
+    "inventory": lambda ctx, members: main.cmd_inventory.callback(ctx),
+    "daily": lambda ctx, members: main.cmd_daily.callback(ctx),
+    "feedpet": lambda ctx, members: main.cmd_feedpet.callback(ctx, 1),
+    "playpet": lambda ctx, members: main.cmd_playpet.callback(ctx),
+}
+
+async def seed(guilds, members):
+    # every player starts rich and stocked so commands take their full path
+    for guild in guilds:
+        async with main.transaction(guild.id):
+            for m in members:
+                await main.ensure_user(guild.id, m.id)
+                await main.set_balance(guild.id, m.id, 10 ** 9)
+                await main.add_fish(guild.id, m.id, 100)
+                await main.add_item(guild.id, m.id, "nuke", 10 ** 6)
+                await main.add_item(guild.id, m.id, "petfood", 10 ** 6)
+
+async def run(args):
+    global _commits
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+    members = [FakeMember(100 + i) for i in range(args.users)]
+    guilds = [FakeGuild(10 + i, members) for i in range(args.guilds)]
+    stats = {"sends": 0, "send_latency": args.send_latency / 1000}
+    channels = [FakeChannel(1000 + i, stats) for i in range(args.channels)]
+
+    await main.init_db()
+    if not args.cooldowns:
+        # measure the full command path instead of the "slow down" reply
+        for kind in main.cooldowns.durations:
+            main.cooldowns.durations[kind] = 0
+    await seed(guilds, members)
+    if main.CACHE_ENABLED:
+        await main.player_cache.flush()
+    gc.collect()
+
+    latencies = {name: [] for name in names}
+    errors = 0
+    _commits = 0
+    queue = asyncio.Queue()
+    for _ in range(args.commands):
+        queue.put_nowait(random.choices(names, weights)[0])
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                name = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            ctx = FakeContext(random.choice(members), random.choice(guilds), random.choice(channels), stats)
+            t0 = time.perf_counter()
+            try:
+                await COMMANDS[name](ctx, members)
+            except Exception as e:
+                errors += 1
+                if errors <= 5:
+                    print(f"{name} failed: {e!r}")
+            latencies[name].append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    commits = _commits
+    await main.outbox.close()
+    await main.shutdown_db()
+
+    def summary(samples):
+        if not samples:
+            return {"count": 0}
+        ordered = sorted(samples)
+        return {
+            "count": len(ordered),
+            "p50_ms": round(statistics.median(ordered) * 1000, 3),
+            "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        }
+
+    all_samples = [s for samples in latencies.values() for s in samples]
+    return {
+        "commands": args.commands,
+        "users": args.users,
+        "guilds": args.guilds,
+        "concurrency": args.concurrency,
+        "cache": main.CACHE_ENABLED,
+        "outbox": main.OUTBOX_ENABLED,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_cmd_s": round(args.commands / elapsed, 1),
+        "latency": summary(all_samples),
+        "per_command": {name: summary(samples) for name, samples in latencies.items()},
+        "commits_per_command": round(commits / args.commands, 3),
+        "sends": stats["sends"],
+        "errors": errors,
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1) if resource else None,
+    }
+
+def print_report(report):
+    lat = report["latency"]
+    print(f"{report['commands']} commands • {report['users']} users • {report['guilds']} guilds • "
+          f"concurrency {report['concurrency']} • cache {'on' if report['cache'] else 'off'} • "
+          f"outbox {'on' if report['outbox'] else 'off'}")
+    print(f"throughput   {report['throughput_cmd_s']} cmd/s ({report['elapsed_s']} s)")
+    print(f"latency      p50 {lat['p50_ms']} ms • p99 {lat['p99_ms']} ms • max {lat['max_ms']} ms")
+    print(f"commits/cmd  {report['commits_per_command']}")
+    print(f"messages     {report['sends']}")
+    print(f"max rss      {report['max_rss_mb']} MB")
+    print(f"errors       {report['errors']}")
+    print()
+    print(f"{'command':<12} {'count':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, s in report["per_command"].items():
+        if s["count"]:
+            print(f"{name:<12} {s['count']:>7} {s['p50_ms']:>9} {s['p99_ms']:>9}")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark the FishNuke command handlers without Discord.")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--guilds", type=int, default=1)
+    parser.add_argument("--channels", type=int, default=5)
+    parser.add_argument("--commands", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32, help="commands in flight at once")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted command mix, e.g. fish=50,buy=20")
+    parser.add_argument("--send-latency", type=float, default=0, help="simulated ctx.send time in ms")
+    parser.add_argument("--cache", action="store_true", help="enable the write-behind player cache")
+    parser.add_argument("--outbox", action="store_true", help="queue and coalesce replies per channel")
+    parser.add_argument("--cooldowns", action="store_true", help="keep real cooldowns (default: disabled)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    main.CACHE_ENABLED = args.cache
+    main.OUTBOX_ENABLED = args.outbox
+    workdir = tempfile.mkdtemp(prefix="fishnuke-bench-")
+    main.db_pool.path = os.path.join(workdir, "bench.db")
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,219 @@
+# simulate.py
+# Monte Carlo model of the FishNuke economy for tuning SHOP prices and DAILY_REWARD offline.
+# Uses the reward functions from main.py (fish_reward, nuke_gamble, nuke_strike) on NumPy
+# arrays, one array slot per simulated player, so millions of player-days run in seconds.
+#
+#   python simulate.py --players 100000 --days 30 --casts 20
+#   python simulate.py --daily 150 --price rod=400 --price nuke=750 --json
+import argparse
+import json
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("simulate.py needs NumPy: pip install numpy")
+
+import main
+
+PERCENTILES = (10, 50, 90, 99)
+
+# -------------------------
+# Player-days
+# -------------------------
+class Cohort:
+    # state of one batch of simulated players, mirroring their players/items rows
+    def __init__(self, size: int, starting_balance: int):
+        self.balance = np.full(size, float(starting_balance))
+        self.fish = np.zeros(size)
+        self.rods = np.zeros(size)
+        # running totals for the report
+        self.minted = np.zeros(size)     # coins created: daily, fishing, gamble wins, salvage
+        self.burned = np.zeros(size)     # coins destroyed: shop purchases, gamble losses
+        self.destroyed = np.zeros(size)  # fish lost to nukes
+
+def play_day(rng, c: Cohort, args, prices):
+    n = len(c.balance)
+    c.balance += args.daily
+    c.minted += args.daily
+
+    for _ in range(args.casts):
+        caught, _, coins = main.fish_reward(c.rods, *rng.random((4, n)))
+        c.fish += caught
+        c.balance += coins
+        c.minted += coins
+
+    # one rod a day while it is affordable and still improves the catch
+    buy = (rng.random(n) < args.rod_rate) & (c.rods < args.max_rods) & (c.balance >= prices["rod"])
+    c.balance -= buy * prices["rod"]
+    c.burned += buy * prices["rod"]
+    c.rods += buy
+
+    # untargeted nuke: pay the nuke price and gamble
+    gamble = (rng.random(n) < args.gamble_rate) & (c.balance >= prices["nuke"])
+    backfired, lost, coins = main.nuke_gamble(c.fish, *rng.random((3, n)), cost=prices["nuke"])
+    lost = gamble * np.minimum(lost, c.fish)
+    coins = gamble * coins
+    c.fish -= lost
+    c.destroyed += lost
+    c.balance += coins - gamble * prices["nuke"]
+    c.minted += np.maximum(coins, 0)
+    c.burned += np.maximum(-coins, 0) + gamble * prices["nuke"]
+
+    # targeted nuke: buy one from the shop and hit a random other player in the cohort
+    strike = (rng.random(n) < args.strike_rate) & (c.balance >= prices["nuke"])
+    targets = rng.permutation(n)
+    target_fish = c.fish[targets]
+    strike &= (targets != np.arange(n)) & (target_fish > 0)
+    _, destroyed, salvage, coin_salvage = main.nuke_strike(target_fish, *rng.random((2, n)))
+    destroyed = strike * np.minimum(destroyed, target_fish)
+    c.balance -= strike * prices["nuke"]
+    c.burned += strike * prices["nuke"]
+    # a permutation hits every target at most once, so a plain fancy-index write is safe
+    c.fish[targets] -= destroyed
+    c.destroyed[targets] += destroyed
+    c.fish += strike * salvage
+    c.balance += strike * coin_salvage
+    c.minted += strike * coin_salvage
+
+# -------------------------
+# Closed-form-ish expectations
+# -------------------------
+def per_cast(rng, draws: int, max_rods: int, rod_price: int):
+    # expected fish/coins per !fish cast at each rod level, and casts for a rod to pay for itself
+    rows = []
+    prev_coins = None
+    for rod in range(max_rods + 1):
+        caught, bonus, coins = main.fish_reward(rod, *rng.random((4, draws)))
+        row = {"rod": rod, "fish": float(caught.mean()), "coins": float(coins.mean()),
+               "big_catch_rate": float((bonus > 0).mean())}
+        if prev_coins is not None:
+            gain = row["coins"] - prev_coins
+            row["rod_payback_casts"] = round(rod_price / gain, 1) if gain > 0 else None
+        prev_coins = row["coins"]
+        rows.append(row)
+    return rows
+
+def nuke_ev(rng, draws: int, price: int, fish_levels):
+    # value of a gamble detonation and of a targeted strike against players of various fish counts
+    fish = np.asarray(fish_levels, dtype=float)
+    gamble = []
+    for f in fish:
+        backfired, lost, coins = main.nuke_gamble(f, *rng.random((3, draws)), cost=price)
+        gamble.append({"fish": int(f), "ev_coins": float(coins.mean() - price),
+                       "backfire_rate": float(backfired.mean()), "fish_lost": float(np.minimum(lost, f).mean())})
+    strike = []
+    for f in fish[fish > 0]:
+        _, destroyed, salvage, coin_salvage = main.nuke_strike(f, *rng.random((2, draws)))
+        strike.append({"target_fish": int(f), "destroyed": float(destroyed.mean()),
+                       "salvage_fish": float(salvage.mean()), "ev_coins": float(coin_salvage.mean() - price)})
+    return {"gamble": gamble, "strike": strike}
+
+# -------------------------
+# Driver
+# -------------------------
+def distribution(values):
+    values = np.asarray(values, dtype=float)
+    out = {"mean": round(float(values.mean()), 1)}
+    for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        out[f"p{p}"] = round(float(v), 1)
+    return out
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    prices = {name: item["price"] for name, item in main.SHOP.items()}
+    prices.update(args.price)
+
+    started = time.perf_counter()
+    finals = {"balance": [], "fish": [], "rods": [], "minted": [], "burned": [], "destroyed": []}
+    left = args.players
+    while left > 0:
+        cohort = Cohort(min(args.batch, left), args.starting_balance)
+        for _ in range(args.days):
+            play_day(rng, cohort, args, prices)
+        for key in finals:
+            finals[key].append(getattr(cohort, key))
+        left -= len(cohort.balance)
+    elapsed = time.perf_counter() - started
+    finals = {key: np.concatenate(parts) for key, parts in finals.items()}
+
+    player_days = args.players * args.days
+    minted, burned = finals["minted"].sum(), finals["burned"].sum()
+    return {
+        "players": args.players,
+        "days": args.days,
+        "player_days": player_days,
+        "elapsed_s": round(elapsed, 3),
+        "player_days_per_s": round(player_days / elapsed, 1),
+        "daily_reward": args.daily,
+        "prices": prices,
+        "coins_minted_per_player_day": round(float(minted / player_days), 1),
+        "coins_burned_per_player_day": round(float(burned / player_days), 1),
+        "net_inflation_per_player_day": round(float((minted - burned) / player_days), 1),
+        "final_balance": distribution(finals["balance"]),
+        "final_fish": distribution(finals["fish"]),
+        "final_rods": distribution(finals["rods"]),
+        "fish_lost_to_nukes": distribution(finals["destroyed"]),
+        "per_cast": per_cast(rng, args.draws, args.max_rods, prices["rod"]),
+        "nuke": nuke_ev(rng, args.draws, prices["nuke"], args.fish_levels),
+    }
+
+def print_report(report):
+    print(f"{report['player_days']:,} player-days ({report['players']:,} players x {report['days']} days) "
+          f"in {report['elapsed_s']} s • daily {report['daily_reward']} • "
+          + " • ".join(f"{k} {v}" for k, v in report["prices"].items()))
+    print(f"coins/player-day   minted {report['coins_minted_per_player_day']} • burned "
+          f"{report['coins_burned_per_player_day']} • net {report['net_inflation_per_player_day']}")
+    print()
+    print(f"{'final':<18} {'mean':>10}" + "".join(f" {'p' + str(p):>10}" for p in PERCENTILES))
+    for key in ("final_balance", "final_fish", "final_rods", "fish_lost_to_nukes"):
+        d = report[key]
+        print(f"{key:<18} {d['mean']:>10}" + "".join(f" {d['p' + str(p)]:>10}" for p in PERCENTILES))
+    print()
+    print(f"{'rod':>4} {'fish/cast':>10} {'coins/cast':>11} {'big catch':>10} {'payback':>9}")
+    for row in report["per_cast"]:
+        payback = row.get("rod_payback_casts")
+        print(f"{row['rod']:>4} {row['fish']:>10.2f} {row['coins']:>11.1f} {row['big_catch_rate']:>10.1%} "
+              f"{'-' if payback is None else payback:>9}")
+    print()
+    print(f"{'gamble':<8} {'own fish':>9} {'EV coins':>9} {'backfire':>9} {'fish lost':>10}")
+    for row in report["nuke"]["gamble"]:
+        print(f"{'':<8} {row['fish']:>9} {row['ev_coins']:>9.1f} {row['backfire_rate']:>9.1%} {row['fish_lost']:>10.1f}")
+    print(f"{'strike':<8} {'target':>9} {'EV coins':>9} {'destroyed':>9} {'salvaged':>10}")
+    for row in report["nuke"]["strike"]:
+        print(f"{'':<8} {row['target_fish']:>9} {row['ev_coins']:>9.1f} {row['destroyed']:>9.1f} {row['salvage_fish']:>10.1f}")
+
+def parse_price(spec: str):
+    name, _, price = spec.partition("=")
+    if name not in main.SHOP or not price.isdigit():
+        raise argparse.ArgumentTypeError(f"expected item=price with item in {', '.join(main.SHOP)}")
+    return name, int(price)
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Simulate the FishNuke economy with the bot's own reward math.")
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--batch", type=int, default=100_000, help="players simulated per NumPy batch")
+    parser.add_argument("--casts", type=int, default=20, help="!fish casts per player per day")
+    parser.add_argument("--rod-rate", type=float, default=0.5, help="chance a player buys a rod on a day they can afford one")
+    parser.add_argument("--max-rods", type=int, default=10)
+    parser.add_argument("--gamble-rate", type=float, default=0.2, help="chance per day of an untargeted !nuke")
+    parser.add_argument("--strike-rate", type=float, default=0.2, help="chance per day of buying a nuke and hitting someone")
+    parser.add_argument("--daily", type=int, default=main.DAILY_REWARD)
+    parser.add_argument("--starting-balance", type=int, default=main.STARTING_BALANCE)
+    parser.add_argument("--price", type=parse_price, action="append", default=[], help="override a shop price, e.g. rod=400")
+    parser.add_argument("--draws", type=int, default=1_000_000, help="samples for the per-cast and nuke EV tables")
+    parser.add_argument("--fish-levels", type=int, nargs="+", default=[0, 10, 50, 200, 1000])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    args.price = dict(args.price)
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main_cli()
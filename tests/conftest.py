@@ -0,0 +1,101 @@
+# Shared fixtures: every test gets a freshly migrated store, once per backend.
+# Postgres runs against TEST_DATABASE_URL (a server the tests may create databases on)
+# or, failing that, a throwaway local server from the pgserver package; without either
+# the postgres cases are skipped.
+import asyncio
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+
+_pg_admin_url = None
+
+def _pg_server_url():
+    global _pg_admin_url
+    if _pg_admin_url is None:
+        _pg_admin_url = os.getenv("TEST_DATABASE_URL", "")
+        if not _pg_admin_url:
+            try:
+                import pgserver
+                _pg_admin_url = pgserver.get_server(tempfile.mkdtemp(prefix="fishnuke-pg-"), cleanup_mode="stop").get_uri()
+            except Exception:
+                _pg_admin_url = ""
+    return _pg_admin_url
+
+@pytest.fixture(scope="session")
+def loop():
+    # one loop for the whole run: main.py's locks and events bind to the first loop that uses them
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+@pytest.fixture
+def run(loop):
+    return loop.run_until_complete
+
+async def _admin(url: str, sql: str):
+    conn = await main.asyncpg.connect(url)
+    try:
+        await conn.execute(sql)
+    finally:
+        await conn.close()
+
+def _reset_state():
+    main.known_users.clear()
+    main._boards.clear()
+    main._leaderboard_embeds.clear()
+    main.cooldowns._last.clear()
+    main.cooldowns._dirty.clear()
+    main.ledger._pending.clear()
+    main.player_cache = main.PlayerCache(main.CACHE_MAX_USERS, main.CACHE_MAX_STALENESS, main.CACHE_FLUSH_THRESHOLD)
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def backend(request, run, tmp_path):
+    # the storage to open; the store fixture (or the test itself) runs init_db on it
+    if request.param == "sqlite":
+        yield main.SqliteStorage(str(tmp_path / "fishnuke.db"), main.DB_POOL_SIZE)
+        return
+    if main.asyncpg is None:
+        pytest.skip("asyncpg is not installed")
+    admin_url = _pg_server_url()
+    if not admin_url:
+        pytest.skip("no Postgres server (set TEST_DATABASE_URL or install pgserver)")
+    name = f"fishnuke_test_{uuid.uuid4().hex[:12]}"
+    run(_admin(admin_url, f"CREATE DATABASE {name}"))
+    base, _, query = admin_url.partition("?")
+    url = base.rsplit("/", 1)[0] + "/" + name + ("?" + query if query else "")
+    try:
+        yield main.PostgresStorage(url, main.PG_POOL_SIZE)
+    finally:
+        run(_admin(admin_url, f"DROP DATABASE IF EXISTS {name}"))
+
+@pytest.fixture(params=[False, True], ids=["direct", "cached"])
+def cache_mode(request, monkeypatch):
+    monkeypatch.setattr(main, "CACHE_ENABLED", request.param)
+    return request.param
+
+@pytest.fixture
+def store(backend, cache_mode, run, monkeypatch):
+    monkeypatch.setattr(main, "db_pool", backend)
+    monkeypatch.setattr(main, "guild_pools", {})
+    _reset_state()
+    run(main.init_db())
+    yield backend
+    run(main.shutdown_db())
+    _reset_state()
+
+@pytest.fixture
+def query(store, run):
+    def query(sql: str, *params):
+        async def fetch():
+            async with store.acquire() as db:
+                return await (await db.execute(sql, params)).fetchall()
+        return run(fetch())
+    return query
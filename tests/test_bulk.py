@@ -0,0 +1,26 @@
+import main
+
+from test_errors import FakeContext
+
+class FakeAttachment:
+    def __init__(self, filename, size):
+        self.filename = filename
+        self.size = size
+
+def test_import_rejects_oversized_files(run, monkeypatch):
+    started = []
+
+    async def start_bulk(*args):
+        started.append(args)
+    monkeypatch.setattr(main, "start_bulk", start_bulk)
+    ctx = FakeContext()
+    run(main.cmd_import.callback(ctx, FakeAttachment("economy.csv", main.IMPORT_MAX_BYTES + 1)))
+    assert started == [] and "limited to" in ctx.sent[0][0]
+    run(main.cmd_import.callback(ctx, FakeAttachment("economy.csv", main.IMPORT_MAX_BYTES)))
+    assert len(started) == 1
+
+def test_parse_import_round_trips_the_export_format():
+    data = b"user_id,balance,fish_count,xp,pet_name,pet_level,pet_happiness,pet_exp,rod\n7,100,3,,Fin,,,,2\n8,-1\n"
+    rows, errors = main._parse_import(data, "csv")
+    assert rows[0][0] == 7 and rows[0][2] == {"rod": 2}
+    assert len(errors) == 1
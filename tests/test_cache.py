@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+import main
+
+pytestmark = pytest.mark.parametrize("cache_mode", [True], indirect=True)
+
+def test_flush_during_load_keeps_the_change(store, run, query, monkeypatch):
+    run(main.ensure_user(1, 1))
+    run(main.player_cache.flush())
+    main.player_cache.forget([(1, 1)])
+    gate = asyncio.Event()
+    load_player = main.load_player
+
+    async def slow_load(db, guild_id, user_id):
+        await gate.wait()
+        return await load_player(db, guild_id, user_id)
+    monkeypatch.setattr(main, "load_player", slow_load)
+
+    async def scenario():
+        task = asyncio.ensure_future(main.add_balance(1, 1, 500))
+        while (1, 1) not in main.player_cache._loading:
+            await asyncio.sleep(0)
+        await main.player_cache.flush()
+        gate.set()
+        await task
+        await main.player_cache.flush()
+    run(scenario())
+    main.player_cache.forget([(1, 1)])
+    assert (1, 1) not in main.player_cache._players
+    assert query("SELECT balance FROM players WHERE guild_id = ? AND user_id = ?", 1, 1) == [
+        (main.STARTING_BALANCE + 500,)]
+
+def test_eviction_keeps_dirty_players(store, run, query, monkeypatch):
+    monkeypatch.setattr(main.player_cache, "max_users", 2)
+    for user_id in range(1, 6):
+        run(main.add_balance(1, user_id, user_id))
+    run(main.player_cache.flush())
+    run(main.get_balance(1, 6))
+    assert len(main.player_cache._players) <= 2
+    assert query("SELECT sum(balance) FROM players WHERE guild_id = ? AND user_id < 6", 1) == [
+        (5 * main.STARTING_BALANCE + 15,)]
+
+def test_concurrent_loads_dont_evict_each_other(store, run, query, monkeypatch):
+    # two misses whose loads finish in the same loop iteration, in a cache with room for one:
+    # the second load must not evict the first player before its caller has marked it
+    run(main.ensure_user(1, 1))
+    run(main.ensure_user(1, 2))
+    run(main.player_cache.flush())
+    main.player_cache.forget([(1, 1), (1, 2)])
+    monkeypatch.setattr(main.player_cache, "max_users", 1)
+    gate = asyncio.Event()
+    load_player = main.load_player
+
+    async def gated_load(db, guild_id, user_id):
+        player = await load_player(db, guild_id, user_id)
+        await gate.wait()
+        return player
+    monkeypatch.setattr(main, "load_player", gated_load)
+
+    async def scenario():
+        credits = asyncio.gather(main.add_balance(1, 1, 1000), main.add_balance(1, 2, 1000))
+        while len(main.player_cache._loading) < 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        gate.set()
+        await credits
+        await main.player_cache.flush()
+    run(scenario())
+    assert query("SELECT user_id, balance FROM players WHERE guild_id = ? ORDER BY user_id", 1) == [
+        (1, main.STARTING_BALANCE + 1000), (2, main.STARTING_BALANCE + 1000)]
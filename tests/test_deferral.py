@@ -0,0 +1,31 @@
+import asyncio
+
+import main
+
+from test_errors import FakeContext, FakeInteraction
+
+async def work(seconds, result="done"):
+    await asyncio.sleep(seconds)
+    return result
+
+def test_fast_commands_are_not_deferred(run):
+    ctx = FakeContext(interaction=FakeInteraction())
+    assert run(main.run_deferred(ctx, work(0.01))) == "done"
+    assert not ctx.interaction.response.is_done()
+
+def test_budget_counts_from_the_interaction(run):
+    # the command already spent most of the window before its slow part started
+    ctx = FakeContext(interaction=FakeInteraction(age=main.INTERACTION_DEFER_AFTER - 0.05))
+    run(main.run_deferred(ctx, work(0.2)))
+    assert ctx.interaction.response.is_done()
+
+def test_chained_calls_share_one_budget(run, monkeypatch):
+    monkeypatch.setattr(main, "INTERACTION_DEFER_AFTER", 0.3)
+    ctx = FakeContext(interaction=FakeInteraction())
+
+    async def command():
+        await main.run_deferred(ctx, work(0.2))
+        assert not ctx.interaction.response.is_done()
+        await main.run_deferred(ctx, work(0.2))
+    run(command())
+    assert ctx.interaction.response.is_done()
@@ -0,0 +1,49 @@
+import datetime
+
+import discord
+from discord.ext import commands
+
+import main
+
+class FakeResponse:
+    def __init__(self):
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+class FakeInteraction:
+    def __init__(self, age=0.0):
+        self.created_at = discord.utils.utcnow() - datetime.timedelta(seconds=age)
+        self.response = FakeResponse()
+
+class FakeContext:
+    def __init__(self, author_id=1, interaction=None):
+        self.author = type("Author", (), {"id": author_id})()
+        self.interaction = interaction
+        self.command = None
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+    async def defer(self):
+        self.interaction.response.done = True
+
+def test_no_command_swallows_errors():
+    # a local handler that re-raises keeps on_command_error from ever seeing the error
+    assert [c.qualified_name for c in main.bot.walk_commands() if c.has_error_handler()] == []
+
+def test_throttled_slash_commands_get_an_answer(run):
+    ctx = FakeContext(interaction=object())
+    run(main.on_command_error(ctx, main.Throttled(3, notify=False)))
+    assert ctx.sent == [("🐢 Slow down! Try again in 3s.", {"ephemeral": True})]
+
+def test_missing_role(run, monkeypatch):
+    monkeypatch.setattr(main, "OWNER_ID", 42)
+    ctx = FakeContext()
+    run(main.on_command_error(ctx, commands.MissingRole(main.ADMIN_ROLE)))
+    assert ctx.sent == [("❌ You don't have permission to use this command.", {})]
+    owner = FakeContext(author_id=42)
+    run(main.on_command_error(owner, commands.MissingRole(main.ADMIN_ROLE)))
+    assert owner.sent == []
@@ -0,0 +1,40 @@
+import asyncio
+
+import main
+
+from test_errors import FakeContext
+
+def test_concurrent_nukes_fire_once(store, run):
+    run(main.add_item(1, 1, "nuke", 3))
+    run(main.add_fish(1, 2, 100))
+    players = [(1, 1), (1, 2)]
+    replies = run(asyncio.gather(*(main.run_locked(1, players, main.run_nuke, 1, 1, "alice", False, 2, "bob")
+                                   for _ in range(3))))
+    assert sum(isinstance(reply, main.discord.Embed) for reply in replies) == 1
+    assert run(main.get_item(1, 1, "nuke")) == 2
+
+def test_concurrent_dailies_pay_once(store, run):
+    run(asyncio.gather(*(main.run_locked(1, [(1, 1)], main.run_daily, 1, 1) for _ in range(5))))
+    assert run(main.get_balance(1, 1)) == main.STARTING_BALANCE + main.DAILY_REWARD
+
+def test_adopt_waits_for_a_playpet_in_flight(store, run, monkeypatch):
+    run(main.ensure_user(0, 1))
+    run(main.update_pet(0, 1, name="Old", level=5, happiness=100, exp=0))
+    get_pet = main.get_pet
+
+    async def slow_get_pet(guild_id, user_id):
+        pet = await get_pet(guild_id, user_id)
+        await asyncio.sleep(0.05)
+        return pet
+    monkeypatch.setattr(main, "get_pet", slow_get_pet)
+    ctx = FakeContext()
+    ctx.guild = None
+
+    async def race():
+        play = asyncio.ensure_future(main.run_locked(0, [(0, 1)], main.run_playpet, 0, 1))
+        await asyncio.sleep(0.01)
+        await main.cmd_adopt.callback(ctx, name="New")
+        await play
+    run(race())
+    name, level, happiness, exp = run(get_pet(0, 1))
+    assert (name, level, happiness, exp) == ("New", 1, 100, 0)
@@ -0,0 +1,40 @@
+import pytest
+
+import main
+
+def legacy_store(run, path):
+    # a database from before guild scoping, holding one player
+    store = main.SqliteStorage(str(path), 1)
+
+    async def create():
+        await store.open()
+        async with store.acquire() as db:
+            await store.begin(db)
+            await main.migrate_v1_base(db)
+            await db.execute("INSERT INTO users (user_id, balance) VALUES (7, 1234)")
+            await store.set_schema_version(db, 1)
+            await db.commit()
+    run(create())
+    return store
+
+def test_legacy_rows_need_a_guild(run, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "LEGACY_GUILD_ID", None)
+    store = legacy_store(run, tmp_path / "legacy.db")
+    try:
+        with pytest.raises(RuntimeError, match="LEGACY_GUILD_ID"):
+            run(store.migrate())
+    finally:
+        run(store.close())
+
+def test_legacy_rows_move_to_the_configured_guild(run, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "LEGACY_GUILD_ID", 99)
+    store = legacy_store(run, tmp_path / "legacy.db")
+
+    async def players():
+        async with store.acquire() as db:
+            return await (await db.execute("SELECT guild_id, user_id, balance FROM players")).fetchall()
+    try:
+        run(store.migrate())
+        assert run(players()) == [(99, 7, 1234)]
+    finally:
+        run(store.close())
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+import main
+
+from test_errors import FakeContext
+
+LIMITS = {"user": (2, 10), "channel": (5, 10)}
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    return now
+
+def test_take_charges_every_bucket_or_none(clock):
+    buckets = main.TokenBuckets(LIMITS, 100)
+    keys = [("user", 1), ("channel", 9)]
+    assert buckets.take(keys) is None
+    assert buckets.take(keys) is None
+    key, retry_after = buckets.take(keys)
+    assert key == ("user", 1) and retry_after == pytest.approx(5)
+    # the refused request left the channel alone: another user still gets through
+    assert buckets.take([("user", 2), ("channel", 9)]) is None
+    assert buckets.take([("user", 3), ("channel", 9)]) is None
+    assert buckets.take([("user", 4), ("channel", 9)]) is None
+    assert buckets.take([("user", 5), ("channel", 9)])[0] == ("channel", 9)
+
+def test_buckets_refill_over_time(clock):
+    buckets = main.TokenBuckets(LIMITS, 100)
+    keys = [("user", 1)]
+    assert buckets.take(keys, cost=2) is None
+    assert buckets.take(keys) is not None
+    clock[0] += 5          # half the window: one of two tokens back
+    assert buckets.take(keys) is None
+    assert buckets.take(keys) is not None
+    clock[0] += 60         # never more than the burst
+    assert buckets.take(keys, cost=2) is None
+    assert buckets.take(keys) is not None
+
+def test_notify_once_per_window(clock):
+    buckets = main.TokenBuckets(LIMITS, 100)
+    assert buckets.notify(("user", 1))
+    assert not buckets.notify(("user", 1))
+    assert buckets.notify(("user", 2))
+    clock[0] += 10
+    assert buckets.notify(("user", 1))
+
+def test_help_listing_spends_one_token(run, monkeypatch):
+    monkeypatch.setattr(main, "rate_limits", main.TokenBuckets(main.RATE_LIMITS, 100))
+    monkeypatch.setattr(main, "OWNER_ID", None)
+    ready = asyncio.Event()
+    ready.set()
+    monkeypatch.setattr(main, "db_ready", ready)
+    ctx = FakeContext()
+    ctx.bot, ctx.guild, ctx.channel = main.bot, None, type("Channel", (), {"id": 9})()
+    ctx.command = main.bot.get_command("help")
+    # bot.invoke runs the once-per-invocation checks, then the help command checks every listing
+    assert run(main.bot.can_run(ctx, call_once=True))
+    help_command = main.bot.help_command.copy()
+    help_command.context = ctx
+    shown = run(help_command.filter_commands(main.bot.commands))
+    user_commands = [c for c in main.bot.commands if not c.hidden and not c.checks]
+    assert len(shown) >= len(user_commands) > 10
+    burst = main.RATE_LIMITS["user"][0]
+    assert main.rate_limits._level(("user", ctx.author.id), main.time.monotonic()) == pytest.approx(burst - 1, abs=0.01)
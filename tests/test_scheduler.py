@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+import main
+
+pytestmark = pytest.mark.parametrize("cache_mode", [False], indirect=True)
+
+@pytest.fixture
+def jobs(monkeypatch):
+    # a "test" job kind that records its payloads; requested before `store` so the
+    # scheduler settings are in place when init_db starts it
+    monkeypatch.setattr(main.scheduler, "horizon", 3)
+    monkeypatch.setattr(main.scheduler, "retry", 1)
+    monkeypatch.setattr(main.scheduler, "max_attempts", 2)
+    monkeypatch.setattr(main.scheduler, "concurrency", 4)
+    state = {"ran": [], "running": 0, "peak": 0, "fail": False}
+
+    async def handler(guild_id, payload):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(0.02)
+            if state["fail"]:
+                raise RuntimeError("boom")
+            state["ran"].append((guild_id, payload["n"]))
+        finally:
+            state["running"] -= 1
+    monkeypatch.setitem(main.scheduler.handlers, "test", handler)
+    return state
+
+def wait_until(run, condition, timeout=6):
+    # condition: a plain or async callable, polled until true or the timeout passes
+    async def check():
+        result = condition()
+        return await result if asyncio.iscoroutine(result) else result
+
+    async def poll():
+        deadline = time.monotonic() + timeout
+        while not await check() and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return await check()
+    return run(poll())
+
+def no_jobs_left(store):
+    async def check():
+        async with store.acquire() as db:
+            return (await (await db.execute("SELECT count(*) FROM jobs")).fetchone())[0] == 0
+    return check
+
+def test_due_jobs_run_with_limited_concurrency(jobs, store, run, query):
+    now = time.time()
+    for n in range(20):
+        run(main.scheduler.schedule(1, "test", now, {"n": n}, key=n))
+    assert wait_until(run, lambda: len(jobs["ran"]) == 20)
+    assert 1 < jobs["peak"] <= 4
+    assert wait_until(run, no_jobs_left(store))
+
+def test_reschedule_replaces_and_cancel_removes(jobs, store, run, query):
+    now = time.time()
+    run(main.scheduler.schedule(1, "test", now + 1, {"n": 1}, key="a"))
+    run(main.scheduler.schedule(1, "test", now + 1, {"n": 2}, key="a"))
+    run(main.scheduler.schedule(1, "test", now + 1, {"n": 3}, key="b"))
+    assert run(main.scheduler.cancel(1, "test", "b"))
+    assert not run(main.scheduler.cancel(1, "test", "b"))
+    assert wait_until(run, lambda: jobs["ran"])
+    run(asyncio.sleep(0.5))
+    assert jobs["ran"] == [(1, 2)]
+    assert query("SELECT count(*) FROM jobs") == [(0,)]
+
+def test_unknown_kind_is_rejected(jobs, store, run):
+    with pytest.raises(ValueError):
+        run(main.scheduler.schedule(1, "no such kind", time.time()))
+
+def test_rolled_back_schedule_never_runs(jobs, store, run, query):
+    async def rolled_back():
+        async with main.transaction(1):
+            await main.scheduler.schedule(1, "test", time.time(), {"n": 1})
+            raise KeyError
+    with pytest.raises(KeyError):
+        run(rolled_back())
+    run(asyncio.sleep(0.3))
+    assert jobs["ran"] == []
+    assert query("SELECT count(*) FROM jobs") == [(0,)]
+
+def test_failed_job_is_retried_then_dropped(jobs, store, run, query):
+    jobs["fail"] = True
+    errors = main.metrics.counter("scheduler_jobs_total", kind="test", result="error")
+    run(main.scheduler.schedule(1, "test", time.time(), {"n": 1}))
+    assert wait_until(run, no_jobs_left(store))
+    assert main.metrics.counter("scheduler_jobs_total", kind="test", result="error") - errors == 2
+
+def test_missed_jobs_run_after_restart(jobs, store, run):
+    run(main.scheduler.schedule(1, "test", time.time() + 1, {"n": 1}))
+    run(main.shutdown_db())
+    run(asyncio.sleep(1.5))
+    assert jobs["ran"] == []
+    run(main.init_db())
+    assert wait_until(run, lambda: jobs["ran"] == [(1, 1)])
+
+def test_jobs_beyond_the_horizon_are_picked_up(jobs, store, run):
+    run(main.scheduler.schedule(1, "test", time.time() + 4, {"n": 1}))
+    assert main.scheduler.pending() == 0
+    assert wait_until(run, lambda: jobs["ran"] == [(1, 1)], timeout=8)
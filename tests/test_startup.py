@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+import main
+
+from test_errors import FakeContext, FakeInteraction
+
+def test_warm_up_retries_then_shuts_down(run, monkeypatch):
+    calls, closed = [], []
+
+    async def warm_db():
+        calls.append(1)
+        raise OSError("disk I/O error")
+
+    async def close():
+        closed.append(1)
+    monkeypatch.setattr(main, "warm_db", warm_db)
+    monkeypatch.setattr(main, "STARTUP_WARM_ATTEMPTS", 2)
+    monkeypatch.setattr(main.bot, "close", close)
+    monkeypatch.setattr(main.bot, "warmup_failed", False)
+    run(main.bot._warm_up())
+    assert len(calls) == 2 and closed == [1] and main.bot.warmup_failed
+
+def test_warm_up_recovers_after_a_failure(run, monkeypatch):
+    calls = []
+
+    async def warm_db():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("database is locked")
+    monkeypatch.setattr(main, "warm_db", warm_db)
+    monkeypatch.setattr(main, "STARTUP_WARM_ATTEMPTS", 2)
+    monkeypatch.setattr(main.bot, "warmup_failed", False)
+    run(main.bot._warm_up())
+    assert len(calls) == 2 and not main.bot.warmup_failed
+
+def test_startup_gate_runs_once_per_invocation():
+    assert main._wait_until_ready in main.bot._check_once
+    assert main._wait_until_ready not in main.bot._checks
+
+def test_startup_gate_acknowledges_slash_commands_before_waiting(run, monkeypatch):
+    monkeypatch.setattr(main, "db_ready", asyncio.Event())
+    monkeypatch.setattr(main, "STARTUP_GATE_WAIT", 0.05)
+    ctx = FakeContext(interaction=FakeInteraction())
+    with pytest.raises(main.NotReady):
+        run(main._wait_until_ready(ctx))
+    assert ctx.interaction.response.is_done()
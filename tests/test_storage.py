@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+import main
+
+def test_migrations_reach_latest_version(store, run):
+    async def version():
+        async with store.acquire() as db:
+            return await store.schema_version(db)
+    assert run(version()) == len(store.migrations)
+    run(store.migrate())   # nothing left to do
+    assert run(version()) == len(store.migrations)
+
+def test_migrate_refuses_newer_schema(store, run):
+    async def bump():
+        async with store.acquire() as db:
+            await store.begin(db)
+            await store.set_schema_version(db, len(store.migrations) + 1)
+            await db.commit()
+    run(bump())
+    with pytest.raises(RuntimeError, match="newer than this bot"):
+        run(store.migrate())
+
+def test_ensure_user_creates_once(store, run):
+    run(main.ensure_user(1, 7))
+    main.known_users.clear()
+    run(main.ensure_user(1, 7))
+    assert run(main.get_balance(1, 7)) == main.STARTING_BALANCE
+    joins = [row for row in run(main.ledger.history(1, 7, 10)) if row[1] == "join"]
+    assert len(joins) == 1
+
+def test_spend_balance_never_overdraws(store, run):
+    run(main.set_balance(1, 1, 10))
+    spent = run(asyncio.gather(*(main.spend_balance(1, 1, 1) for _ in range(30))))
+    assert sum(spent) == 10
+    assert run(main.get_balance(1, 1)) == 0
+
+def test_take_item_never_goes_negative(store, run):
+    run(main.add_item(1, 1, "nuke", 5))
+    taken = run(asyncio.gather(*(main.take_item(1, 1, "nuke", 1) for _ in range(20))))
+    assert sum(taken) == 5
+    assert run(main.get_item(1, 1, "nuke")) == 0
+    assert not run(main.take_item(1, 1, "nuke", 1))
+
+def test_item_upserts(store, run):
+    run(main.add_item(1, 1, "rod", 3))
+    run(main.add_item(1, 1, "rod", 2))
+    assert run(main.get_item(1, 1, "rod")) == 5
+    run(main.set_item(1, 1, "petfood", 7))
+    run(main.set_item(1, 1, "petfood", 4))
+    assert run(main.get_item(1, 1, "petfood")) == 4
+
+@pytest.mark.parametrize("cache_mode", [False], indirect=True)
+def test_cooldown_upsert_only_moves_forward(store, run, query):
+    async def write(ts):
+        async with store.acquire() as db:
+            await db.execute(main.cooldowns._upsert("nuke"), (1, 1, ts))
+            await db.commit()
+    run(write(1000))
+    run(write(500))
+    assert query("SELECT last_nuke FROM players WHERE guild_id = ? AND user_id = ?", 1, 1) == [(1000,)]
+
+@pytest.mark.parametrize("cache_mode", [True], indirect=True)
+def test_ledger_replay_restores_unflushed_cache(store, run, query):
+    run(main.add_balance(1, 1, 1000))
+    run(main.add_fish(1, 1, 5))
+    run(main.ledger.flush())
+    # crash: the cached players never reach the players table, the ledger already did
+    main.player_cache._dirty.clear()
+    run(main.shutdown_db())
+    main.known_users.clear()
+    main.player_cache = main.PlayerCache(main.CACHE_MAX_USERS, main.CACHE_MAX_STALENESS, main.CACHE_FLUSH_THRESHOLD)
+    run(main.init_db())
+    assert query("SELECT balance, fish_count FROM players WHERE guild_id = ? AND user_id = ?", 1, 1) == [
+        (main.STARTING_BALANCE + 1000, 5)]
+
+def test_known_users_stay_bounded_in_low_memory_mode(store, run, monkeypatch):
+    monkeypatch.setattr(main, "known_users", main.KnownUsers(max_size=3))
+    for user_id in range(10):
+        run(main.ensure_user(1, user_id))
+    assert len(main.known_users) == 3
+    # a forgotten player is looked up again, not created twice
+    run(main.ensure_user(1, 0))
+    joins = [row for row in run(main.ledger.history(1, 0, 10)) if row[1] == "join"]
+    assert len(joins) == 1
+
+@pytest.mark.parametrize("cache_mode", [False], indirect=True)
+def test_shard_workers_load_only_their_guilds(store, run, monkeypatch):
+    mine, theirs = 2 << 22, 1 << 22     # shard 0 and shard 1 of 2
+    for guild_id in (mine, theirs):
+        run(main.ensure_user(guild_id, 7))
+        run(main.set_last_nuke(guild_id, 7, int(main.time.time())))
+    run(main.shutdown_db())
+    main.known_users.clear()
+    main.cooldowns._last.clear()
+    monkeypatch.setattr(main, "SHARD_COUNT", 2)
+    monkeypatch.setattr(main, "SHARD_IDS", [0])
+    run(main.init_db())
+    assert (mine, 7) in main.known_users and (theirs, 7) not in main.known_users
+    assert {key[0] for key in main.cooldowns._last} == {mine}